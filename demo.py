@@ -4,9 +4,11 @@ Demo script showing the complete Dundie Awards flow:
 nominations → voting → winners → notifications
 """
 
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import time
 from typing import Dict, List
 
 # Service URLs
@@ -17,23 +19,39 @@ SERVICES = {
     "notifications": "http://localhost:8004"
 }
 
-def check_services_health():
+# Keep-alive connection pool shared by the synchronous steps
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+async def _probe(session: aiohttp.ClientSession, name: str, url: str):
+    """Probe a single service's health endpoint, returning (name, ok, status)"""
+    try:
+        async with session.get(f"{url}/health", timeout=aiohttp.ClientTimeout(total=5)) as response:
+            if response.status == 200:
+                return name, True, "Healthy"
+            return name, False, "Unhealthy"
+    except Exception as e:
+        return name, False, f"Unreachable - {e}"
+
+async def check_services_health(session: aiohttp.ClientSession):
     """Check if all services are running"""
     print("🔍 Checking service health...")
-    for service, url in SERVICES.items():
-        try:
-            response = requests.get(f"{url}/health", timeout=5)
-            if response.status_code == 200:
-                print(f"✅ {service.title()} Service: Healthy")
-            else:
-                print(f"❌ {service.title()} Service: Unhealthy")
-                return False
-        except Exception as e:
-            print(f"❌ {service.title()} Service: Unreachable - {e}")
-            return False
-    return True
+    # Probe every service at once so wall time is the slowest probe, not the sum
+    results = await asyncio.gather(
+        *[_probe(session, name, url) for name, url in SERVICES.items()]
+    )
+    for name, ok, status in results:
+        print(f"{'✅' if ok else '❌'} {name.title()} Service: {status}")
+    return all(ok for _, ok, _ in results)
+
+async def _post_json(session: aiohttp.ClientSession, url: str, payload: Dict):
+    """POST a JSON payload and return (status, parsed body or text)"""
+    async with session.post(url, json=payload) as response:
+        if response.status == 200:
+            return response.status, await response.json()
+        return response.status, await response.text()
 
-def create_sample_nominations():
+async def create_sample_nominations(session: aiohttp.ClientSession):
     """Create sample nominations for the demo"""
     print("\n📝 Creating sample nominations...")
     
@@ -70,22 +88,40 @@ def create_sample_nominations():
         }
     ]
     
+    # Nominations are independent, so submit them all at once
+    url = f"{SERVICES['nominations']}/nominations"
+    results = await asyncio.gather(
+        *[_post_json(session, url, nom_data) for nom_data in nominations],
+        return_exceptions=True
+    )
+    
     created_nominations = []
-    for nom_data in nominations:
-        try:
-            response = requests.post(f"{SERVICES['nominations']}/nominations", json=nom_data)
-            if response.status_code == 200:
-                nomination = response.json()
-                created_nominations.append(nomination)
-                print(f"✅ Created nomination: {nomination['employee_name']} for '{nomination['category']}'")
-            else:
-                print(f"❌ Failed to create nomination: {response.text}")
-        except Exception as e:
-            print(f"❌ Error creating nomination: {e}")
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"❌ Error creating nomination: {result}")
+            continue
+        status, body = result
+        if status == 200:
+            created_nominations.append(body)
+            print(f"✅ Created nomination: {body['employee_name']} for '{body['category']}'")
+        else:
+            print(f"❌ Failed to create nomination: {body}")
     
     return created_nominations
 
-def simulate_voting(nominations: List[Dict]):
+async def _cast_vote(session: aiohttp.ClientSession, nomination_id: str, voter_id: str):
+    """Cast a single vote, returning (voter_id, status, body); status is None on error"""
+    vote_data = {
+        "nomination_id": nomination_id,
+        "voter_id": voter_id
+    }
+    try:
+        status, body = await _post_json(session, f"{SERVICES['voting']}/votes", vote_data)
+    except Exception as e:
+        return voter_id, None, e
+    return voter_id, status, body
+
+async def simulate_voting(session: aiohttp.ClientSession, nominations: List[Dict]):
     """Simulate voting on the nominations"""
     print("\n🗳️  Simulating voting...")
     
@@ -98,32 +134,40 @@ def simulate_voting(nominations: List[Dict]):
         4: ["emp_001", "emp_002", "emp_003", "emp_007"]    # Kevin gets 4 votes
     }
     
+    # Votes don't depend on each other once the nominations exist, so cast
+    # every vote across all nominations in a single concurrent batch
+    ballots = [
+        (i, nomination["id"], voter_id)
+        for i, nomination in enumerate(nominations)
+        for voter_id in voting_patterns.get(i, [])
+    ]
+    results = await asyncio.gather(
+        *[_cast_vote(session, nomination_id, voter_id) for _, nomination_id, voter_id in ballots]
+    )
+    
+    # Regroup (voter_id, status, body) outcomes per nomination for the summary
+    outcomes: Dict[int, List] = {}
+    for (i, _, _), outcome in zip(ballots, results):
+        outcomes.setdefault(i, []).append(outcome)
+    
     for i, nomination in enumerate(nominations):
-        if i in voting_patterns:
-            voters = voting_patterns[i]
-            print(f"\n📋 Voting for {nomination['employee_name']} ({nomination['category']}):")
-            
-            for voter_id in voters:
-                vote_data = {
-                    "nomination_id": nomination["id"],
-                    "voter_id": voter_id
-                }
-                try:
-                    response = requests.post(f"{SERVICES['voting']}/votes", json=vote_data)
-                    if response.status_code == 200:
-                        vote = response.json()
-                        print(f"  ✅ {vote['voter_name']} voted")
-                    else:
-                        print(f"  ❌ Vote failed: {response.text}")
-                except Exception as e:
-                    print(f"  ❌ Error voting: {e}")
+        if i not in voting_patterns:
+            continue
+        print(f"\n📋 Voting for {nomination['employee_name']} ({nomination['category']}):")
+        for voter_id, status, body in outcomes.get(i, []):
+            if status is None:
+                print(f"  ❌ Error voting: {body}")
+            elif status == 200:
+                print(f"  ✅ {body['voter_name']} voted")
+            else:
+                print(f"  ❌ Vote failed: {body}")
 
 def calculate_winners():
     """Calculate winners based on votes"""
     print("\n🏆 Calculating winners...")
     
     try:
-        response = requests.post(f"{SERVICES['winners']}/winners/calculate")
+        response = _SESSION.post(f"{SERVICES['winners']}/winners/calculate")
         if response.status_code == 200:
             result = response.json()
             print(f"✅ {result['message']}")
@@ -144,7 +188,7 @@ def send_notifications():
     print("\n📧 Sending notifications to winners...")
     
     try:
-        response = requests.post(f"{SERVICES['notifications']}/notifications/send")
+        response = _SESSION.post(f"{SERVICES['notifications']}/notifications/send")
         if response.status_code == 200:
             result = response.json()
             print(f"✅ {result['message']}")
@@ -169,7 +213,7 @@ def show_final_results():
     
     try:
         # Get winners
-        response = requests.get(f"{SERVICES['winners']}/winners")
+        response = _SESSION.get(f"{SERVICES['winners']}/winners")
         if response.status_code == 200:
             winners = response.json()
             
@@ -187,7 +231,7 @@ def show_final_results():
             print("Failed to get winners")
             
         # Get notification count
-        response = requests.get(f"{SERVICES['notifications']}/notifications")
+        response = _SESSION.get(f"{SERVICES['notifications']}/notifications")
         if response.status_code == 200:
             notifications = response.json()
             print(f"📧 {len(notifications)} notifications sent")
@@ -195,38 +239,41 @@ def show_final_results():
     except Exception as e:
         print(f"❌ Error getting final results: {e}")
 
-def main():
+async def main_async():
     """Run the complete Dundie Awards demo"""
     print("🏆 Welcome to the Dundie Awards Backend Demo! 🏆")
     print("=" * 60)
     
-    if not check_services_health():
-        print("\n❌ Some services are not running. Please start all services first.")
-        print("Run: docker-compose up -d")
-        return
-    
-    # Step 1: Create nominations
-    nominations = create_sample_nominations()
-    if not nominations:
-        print("❌ No nominations created. Exiting.")
-        return
-    
-    time.sleep(1)
+    # Reuse pooled keep-alive connections for the concurrent fan-out steps
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        if not await check_services_health(session):
+            print("\n❌ Some services are not running. Please start all services first.")
+            print("Run: docker-compose up -d")
+            return
+        
+        # Step 1: Create nominations
+        nominations = await create_sample_nominations(session)
+        if not nominations:
+            print("❌ No nominations created. Exiting.")
+            return
+        
+        await asyncio.sleep(1)
+        
+        # Step 2: Simulate voting
+        await simulate_voting(session, nominations)
     
-    # Step 2: Simulate voting
-    simulate_voting(nominations)
-    
-    time.sleep(1)
+    await asyncio.sleep(1)
     
     # Step 3: Calculate winners
     winners = calculate_winners()
     
-    time.sleep(1)
+    await asyncio.sleep(1)
     
     # Step 4: Send notifications
     send_notifications()
     
-    time.sleep(1)
+    await asyncio.sleep(1)
     
     # Step 5: Show final results
     show_final_results()
@@ -234,5 +281,9 @@ def main():
     print("\n🎉 Dundie Awards ceremony complete!")
     print("Thanks for participating in the most prestigious award ceremony in Scranton!")
 
+def main():
+    """Entry point for the demo"""
+    asyncio.run(main_async())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,24 +1,25 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Dict
-import sys
-import os
-
-# Add parent directory to path for shared imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-services_dir = os.path.dirname(current_dir)
-root_dir = os.path.dirname(services_dir)
-sys.path.insert(0, root_dir)
+import asyncio
 
 from shared.models import Nomination, AwardCategory
-from shared.utils import generate_id, get_current_timestamp, SAMPLE_EMPLOYEES
-from shared.audit_utils import audit_nomination_submitted
+from shared.utils import generate_id, get_current_timestamp, ResponseCache, SAMPLE_EMPLOYEES, EMPLOYEES_BY_ID
+from shared.audit_utils import audit_nomination_submitted, init_audit_publisher, close_audit_publisher
 
-app = FastAPI(title="Nominations Service", version="1.0.0")
+app = FastAPI(title="Nominations Service", version="1.0.0", default_response_class=ORJSONResponse)
 
 # In-memory storage (in production, would use a database)
 nominations_db: Dict[str, Nomination] = {}
 
+# Guards writes to nominations_db
+_write_lock = asyncio.Lock()
+
+# Serialized /nominations responses, invalidated on every write
+_nominations_cache = ResponseCache()
+_nominations_json = TypeAdapter(List[Nomination]).dump_json
+
 class CreateNominationRequest(BaseModel):
     employee_id: str
     category: AwardCategory
@@ -38,8 +39,8 @@ async def get_employees():
 async def create_nomination(request: CreateNominationRequest):
     """Create a new nomination"""
     # Find employee and nominator names
-    employee = next((emp for emp in SAMPLE_EMPLOYEES if emp["id"] == request.employee_id), None)
-    nominator = next((emp for emp in SAMPLE_EMPLOYEES if emp["id"] == request.nominator_id), None)
+    employee = EMPLOYEES_BY_ID.get(request.employee_id)
+    nominator = EMPLOYEES_BY_ID.get(request.nominator_id)
     
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -58,7 +59,9 @@ async def create_nomination(request: CreateNominationRequest):
         created_at=get_current_timestamp()
     )
     
-    nominations_db[nomination.id] = nomination
+    async with _write_lock:
+        nominations_db[nomination.id] = nomination
+        _nominations_cache.invalidate()
     
     # Emit audit event
     try:
@@ -78,10 +81,13 @@ async def create_nomination(request: CreateNominationRequest):
 @app.get("/nominations", response_model=List[Nomination])
 async def get_nominations(category: AwardCategory = None):
     """Get all nominations, optionally filtered by category"""
-    nominations = list(nominations_db.values())
-    if category:
-        nominations = [n for n in nominations if n.category == category]
-    return nominations
+    body = _nominations_cache.get(category)
+    if body is None:
+        nominations = list(nominations_db.values())
+        if category:
+            nominations = [n for n in nominations if n.category == category]
+        body = _nominations_cache.set(category, _nominations_json(nominations))
+    return Response(content=body, media_type="application/json")
 
 @app.get("/nominations/{nomination_id}", response_model=Nomination)
 async def get_nomination(nomination_id: str):
@@ -90,6 +96,16 @@ async def get_nomination(nomination_id: str):
         raise HTTPException(status_code=404, detail="Nomination not found")
     return nominations_db[nomination_id]
 
+@app.on_event("startup")
+async def startup_event():
+    """Start the background audit event publisher"""
+    await init_audit_publisher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Publish any queued audit events before exiting"""
+    await close_audit_publisher()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -1,27 +1,61 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Dict
-import sys
 import os
-import requests
-
-# Add parent directory to path for shared imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-services_dir = os.path.dirname(current_dir)
-root_dir = os.path.dirname(services_dir)
-sys.path.insert(0, root_dir)
+import asyncio
+import time
+import httpx
 
 from shared.models import Notification
-from shared.utils import generate_id, get_current_timestamp
-from shared.audit_utils import audit_notification_sent
+from shared.utils import generate_id, get_current_timestamp, ResponseCache
+from shared.audit_utils import audit_notification_sent, init_audit_publisher, close_audit_publisher
 
-app = FastAPI(title="Notifications Service", version="1.0.0")
+app = FastAPI(title="Notifications Service", version="1.0.0", default_response_class=ORJSONResponse)
 
 # In-memory storage
 notifications_db: Dict[str, Notification] = {}
 
+# Winner notifications indexed by winner ID for duplicate checks
+notifications_by_winner: Dict[str, Notification] = {}
+
+# Guards the per-winner duplicate check and insert
+_write_lock = asyncio.Lock()
+
+# Serialized /notifications responses, invalidated on every write
+_notifications_cache = ResponseCache()
+_notifications_json = TypeAdapter(List[Notification]).dump_json
+
 # Service configuration
 WINNERS_SERVICE_URL = os.getenv("WINNERS_SERVICE_URL", "http://localhost:8003")
+WINNERS_CACHE_TTL = float(os.getenv("WINNERS_CACHE_TTL", "1.0"))  # seconds
+
+# Congratulatory message sent to each winner
+_WINNER_MESSAGE = """🏆 Congratulations {employee_name}! 
+
+You've won the Dundie Award for '{category}' with {total_votes} votes!
+
+Reason: {reason}
+
+Your award ceremony will be held at Chili's at 7 PM. Drinks are on Michael Scott!
+
+- The Dundie Awards Committee""".format
+
+# Short-lived cache of the winners service response
+_winners_cache = {"at": 0.0, "data": None}
+
+async def _get_winners_cached(ttl: float = WINNERS_CACHE_TTL):
+    """Fetch current winners, reusing a recent response within the TTL"""
+    if _winners_cache["data"] is not None and time.monotonic() - _winners_cache["at"] < ttl:
+        return _winners_cache["data"]
+    
+    winners_response = await app.state.http.get(f"{WINNERS_SERVICE_URL}/winners")
+    if winners_response.status_code != 200:
+        raise HTTPException(status_code=503, detail="Unable to fetch winners")
+    
+    _winners_cache["data"] = winners_response.json()
+    _winners_cache["at"] = time.monotonic()
+    return _winners_cache["data"]
 
 @app.get("/health")
 async def health_check():
@@ -32,45 +66,40 @@ async def send_notifications():
     """Send notifications to all current winners"""
     try:
         # Get all winners
-        winners_response = requests.get(f"{WINNERS_SERVICE_URL}/winners")
-        if winners_response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Unable to fetch winners")
-        winners = winners_response.json()
+        winners = await _get_winners_cached()
         
         new_notifications = []
         
         for winner in winners:
-            # Check if notification already sent for this winner
-            existing_notification = next((n for n in notifications_db.values() 
-                                        if n.winner_id == winner["id"]), None)
-            if existing_notification:
-                continue
-            
-            # Create congratulatory message
-            message = f"""🏆 Congratulations {winner['employee_name']}! 
-
-You've won the Dundie Award for '{winner['category']}' with {winner['total_votes']} votes!
-
-Reason: {winner['reason']}
-
-Your award ceremony will be held at Chili's at 7 PM. Drinks are on Michael Scott!
-
-- The Dundie Awards Committee"""
-            
-            # Create notification
-            notification = Notification(
-                id=generate_id(),
-                winner_id=winner["id"],
-                employee_id=winner["employee_id"],
-                employee_name=winner["employee_name"],
-                category=winner["category"],
-                message=message,
-                sent=True,  # In real implementation, would send email/SMS here
-                created_at=get_current_timestamp()
-            )
-            
-            notifications_db[notification.id] = notification
-            new_notifications.append(notification)
+            async with _write_lock:
+                # Check if notification already sent for this winner
+                if winner["id"] in notifications_by_winner:
+                    continue
+                
+                # Create congratulatory message
+                message = _WINNER_MESSAGE(
+                    employee_name=winner["employee_name"],
+                    category=winner["category"],
+                    total_votes=winner["total_votes"],
+                    reason=winner["reason"]
+                )
+                
+                # Create notification
+                notification = Notification(
+                    id=generate_id(),
+                    winner_id=winner["id"],
+                    employee_id=winner["employee_id"],
+                    employee_name=winner["employee_name"],
+                    category=winner["category"],
+                    message=message,
+                    sent=True,  # In real implementation, would send email/SMS here
+                    created_at=get_current_timestamp()
+                )
+                
+                notifications_db[notification.id] = notification
+                notifications_by_winner[notification.winner_id] = notification
+                _notifications_cache.invalidate()
+                new_notifications.append(notification)
             
             # Emit audit event
             try:
@@ -89,16 +118,19 @@ Your award ceremony will be held at Chili's at 7 PM. Drinks are on Michael Scott
             "notifications": new_notifications
         }
         
-    except requests.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(status_code=503, detail=f"Service communication error: {str(e)}")
 
 @app.get("/notifications", response_model=List[Notification])
 async def get_notifications(employee_id: str = None):
     """Get all notifications, optionally filtered by employee"""
-    notifications = list(notifications_db.values())
-    if employee_id:
-        notifications = [n for n in notifications if n.employee_id == employee_id]
-    return notifications
+    body = _notifications_cache.get(employee_id)
+    if body is None:
+        notifications = list(notifications_db.values())
+        if employee_id:
+            notifications = [n for n in notifications if n.employee_id == employee_id]
+        body = _notifications_cache.set(employee_id, _notifications_json(notifications))
+    return Response(content=body, media_type="application/json")
 
 @app.get("/notifications/{notification_id}", response_model=Notification)
 async def get_notification(notification_id: str):
@@ -111,6 +143,8 @@ async def get_notification(notification_id: str):
 async def clear_notifications():
     """Clear all notifications (for testing purposes)"""
     notifications_db.clear()
+    notifications_by_winner.clear()
+    _notifications_cache.invalidate()
     return {"message": "All notifications cleared"}
 
 class ManualNotificationRequest(BaseModel):
@@ -133,8 +167,21 @@ async def send_manual_notification(request: ManualNotificationRequest):
     )
     
     notifications_db[notification.id] = notification
+    _notifications_cache.invalidate()
     return notification
 
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared HTTP client and start the audit event publisher"""
+    app.state.http = httpx.AsyncClient(timeout=5.0)
+    await init_audit_publisher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP client and flush queued audit events"""
+    await app.state.http.aclose()
+    await close_audit_publisher()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8004)
\ No newline at end of file
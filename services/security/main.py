@@ -1,27 +1,47 @@
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel
-from typing import List, Dict, Optional
-import sys
-import os
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Dict, Optional, Set
 import json
 import asyncio
-from datetime import datetime, timedelta
-
-# Add parent directory to path for shared imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-services_dir = os.path.dirname(current_dir)
-root_dir = os.path.dirname(services_dir)
-sys.path.insert(0, root_dir)
+import calendar
+import heapq
+import time
+from collections import Counter, deque
+from datetime import datetime
+from itertools import islice, takewhile
+from sortedcontainers import SortedKeyList
 
 from shared.models import AuditEvent, AuditLog, AuditEventType
-from shared.utils import generate_id, get_current_timestamp
+from shared.utils import generate_id, get_current_timestamp, ResponseCache
 from shared.audit_utils import calculate_risk_score
 
-app = FastAPI(title="Security/Audit Service - Dwight's Security Desk", version="1.0.0")
+app = FastAPI(title="Security/Audit Service - Dwight's Security Desk", version="1.0.0", default_response_class=ORJSONResponse)
 
 # In-memory storage (in production, would use a database)
 audit_logs_db: Dict[str, AuditLog] = {}
-processed_events: Dict[str, bool] = {}
+processed_events: Set[str] = set()
+
+def _epoch(timestamp: datetime) -> float:
+    """Seconds since the epoch, treating naive datetimes as UTC"""
+    return calendar.timegm(timestamp.utctimetuple()) + timestamp.microsecond / 1e6
+
+# Audit logs ordered by creation time so queries don't re-sort every log
+audit_logs_by_time = SortedKeyList(key=lambda log: _epoch(log.created_at))  # oldest first
+
+# Uninvestigated logs at or above the suspicious threshold, riskiest first
+SUSPICIOUS_RISK_SCORE = 50
+high_risk_logs = SortedKeyList(key=lambda log: -log.risk_score)
+
+# Rolling counters for the metrics dashboard, maintained as logs arrive
+_metric_counts: Counter = Counter()  # high_risk, investigated, pending
+_events_by_type: Counter = Counter()  # keyed by event type value
+_recent_suspicious: deque = deque()  # (created epoch seconds, log) for risk >= 60, in arrival order
+RECENT_WINDOW_SECONDS = 24 * 60 * 60
+
+# Serialized /audit/logs responses, invalidated on every write
+_audit_logs_cache = ResponseCache()
+_audit_logs_json = TypeAdapter(List[AuditLog]).dump_json
 
 class InvestigateRequest(BaseModel):
     investigation_notes: str
@@ -48,23 +68,20 @@ async def get_audit_logs(
     limit: int = Query(100, ge=1, le=1000)
 ):
     """Get audit logs with optional filtering"""
-    logs = list(audit_logs_db.values())
-    
-    # Apply filters
-    if event_type:
-        logs = [log for log in logs if log.event_type == event_type]
-    if service_name:
-        logs = [log for log in logs if log.service_name == service_name]
-    if user_id:
-        logs = [log for log in logs if log.user_id == user_id]
-    if min_risk_score is not None:
-        logs = [log for log in logs if log.risk_score >= min_risk_score]
-    if investigated is not None:
-        logs = [log for log in logs if log.investigated == investigated]
-    
-    # Sort by created_at descending and limit
-    logs.sort(key=lambda x: x.created_at, reverse=True)
-    return logs[:limit]
+    cache_key = (event_type, service_name, user_id, min_risk_score, investigated, limit)
+    body = _audit_logs_cache.get(cache_key)
+    if body is None:
+        # Walk newest first, applying filters lazily until the limit is reached
+        logs = (
+            log for log in reversed(audit_logs_by_time)
+            if (not event_type or log.event_type == event_type)
+            and (not service_name or log.service_name == service_name)
+            and (not user_id or log.user_id == user_id)
+            and (min_risk_score is None or log.risk_score >= min_risk_score)
+            and (investigated is None or log.investigated == investigated)
+        )
+        body = _audit_logs_cache.set(cache_key, _audit_logs_json(list(islice(logs, limit))))
+    return Response(content=body, media_type="application/json")
 
 @app.get("/audit/logs/{log_id}", response_model=AuditLog)
 async def get_audit_log(log_id: str):
@@ -80,9 +97,15 @@ async def investigate_audit_log(log_id: str, request: InvestigateRequest):
         raise HTTPException(status_code=404, detail="Audit log not found")
     
     log = audit_logs_db[log_id]
+    if not log.investigated:
+        _metric_counts["investigated"] += 1
+        if log.risk_score >= SUSPICIOUS_RISK_SCORE:
+            _metric_counts["pending"] -= 1
+            high_risk_logs.discard(log)
     log.investigated = True
     log.investigation_notes = request.investigation_notes
     log.investigated_at = get_current_timestamp()
+    _audit_logs_cache.invalidate()
     
     return {"message": "Audit log investigated successfully", "log": log}
 
@@ -92,54 +115,46 @@ async def get_suspicious_activity(
     limit: int = Query(50, ge=1, le=500)
 ):
     """Get suspicious activities based on risk score"""
-    logs = list(audit_logs_db.values())
-    suspicious_logs = [log for log in logs if log.risk_score >= min_risk_score and not log.investigated]
-    suspicious_logs.sort(key=lambda x: x.risk_score, reverse=True)
-    return suspicious_logs[:limit]
+    if min_risk_score < SUSPICIOUS_RISK_SCORE:
+        # Below the indexed threshold, fall back to scanning every log
+        logs = [log for log in audit_logs_db.values() if log.risk_score >= min_risk_score and not log.investigated]
+        logs.sort(key=lambda x: x.risk_score, reverse=True)
+        return logs[:limit]
+    
+    # The index is already ordered riskiest first, so stop at the first log below the threshold
+    suspicious_logs = takewhile(lambda log: log.risk_score >= min_risk_score, high_risk_logs)
+    return list(islice(suspicious_logs, limit))
 
 @app.get("/audit/metrics", response_model=SecurityMetrics)
 async def get_security_metrics():
     """Get security and audit metrics for Dwight's dashboard"""
-    logs = list(audit_logs_db.values())
-    
-    # Calculate metrics
-    total_events = len(logs)
-    high_risk_events = len([log for log in logs if log.risk_score >= 70])
-    investigated_events = len([log for log in logs if log.investigated])
-    pending_investigations = len([log for log in logs if log.risk_score >= 50 and not log.investigated])
-    
-    # Events by type
-    events_by_type = {}
-    for log in logs:
-        event_type = log.event_type.value
-        events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
-    
     # Recent suspicious activity (last 24 hours, risk >= 60)
-    recent_cutoff = get_current_timestamp() - timedelta(hours=24)
-    recent_suspicious = []
-    for log in logs:
-        try:
-            if log.created_at >= recent_cutoff and log.risk_score >= 60:
-                recent_suspicious.append(log)
-        except TypeError:
-            # Handle timezone mismatch - skip this log
-            continue
-    recent_suspicious.sort(key=lambda x: x.risk_score, reverse=True)
+    recent_cutoff = time.time() - RECENT_WINDOW_SECONDS
+    while _recent_suspicious and _recent_suspicious[0][0] < recent_cutoff:
+        _recent_suspicious.popleft()
+    # Logs can arrive out of order, so re-check entries behind the head
+    recent_suspicious = [log for created, log in _recent_suspicious if created >= recent_cutoff]
     
     return SecurityMetrics(
-        total_events=total_events,
-        high_risk_events=high_risk_events,
-        investigated_events=investigated_events,
-        pending_investigations=pending_investigations,
-        events_by_type=events_by_type,
-        recent_suspicious_activity=recent_suspicious[:10]
+        total_events=len(audit_logs_db),
+        high_risk_events=_metric_counts["high_risk"],
+        investigated_events=_metric_counts["investigated"],
+        pending_investigations=_metric_counts["pending"],
+        events_by_type=dict(_events_by_type),
+        recent_suspicious_activity=heapq.nlargest(10, recent_suspicious, key=lambda x: x.risk_score)
     )
 
 @app.delete("/audit/logs")
 async def clear_audit_logs():
     """Clear all audit logs (for testing purposes)"""
     audit_logs_db.clear()
+    audit_logs_by_time.clear()
+    high_risk_logs.clear()
     processed_events.clear()
+    _metric_counts.clear()
+    _events_by_type.clear()
+    _recent_suspicious.clear()
+    _audit_logs_cache.invalidate()
     return {"message": "All audit logs cleared - Dwight's desk is clean!"}
 
 async def process_audit_event(event: AuditEvent):
@@ -151,7 +166,9 @@ async def process_audit_event(event: AuditEvent):
     # Calculate risk score
     risk_score = calculate_risk_score(event)
     
-    # Create audit log
+    # Create audit log. The validating constructor is kept deliberately:
+    # with pydantic 2.5, model_construct's Python-level field loop is slower
+    # than the Rust validator for this model.
     audit_log = AuditLog(
         id=generate_id(),
         event_id=event.id,
@@ -167,7 +184,20 @@ async def process_audit_event(event: AuditEvent):
     
     # Store the audit log
     audit_logs_db[audit_log.id] = audit_log
-    processed_events[event.id] = True
+    audit_logs_by_time.add(audit_log)
+    if risk_score >= SUSPICIOUS_RISK_SCORE:
+        high_risk_logs.add(audit_log)
+    processed_events.add(event.id)
+    _audit_logs_cache.invalidate()
+    
+    # Update rolling metrics
+    _events_by_type[event.event_type.value] += 1
+    if risk_score >= 70:
+        _metric_counts["high_risk"] += 1
+    if risk_score >= 60:
+        _recent_suspicious.append((_epoch(audit_log.created_at), audit_log))
+    if risk_score >= SUSPICIOUS_RISK_SCORE:
+        _metric_counts["pending"] += 1
     
     # Log suspicious activity
     if risk_score >= 70:
@@ -180,21 +210,29 @@ class MockAuditEventReceiver:
     
     def __init__(self):
         self.running = False
+        self._stop_event = asyncio.Event()
     
     async def start_listening(self):
         """Start listening for audit events (mock implementation)"""
+        if self._stop_event.is_set():
+            # stop_listening() ran before the listener got going; honour it
+            self._stop_event.clear()
+            return
+        
         self.running = True
         print("🕵️ Dwight's Security Desk is now monitoring for suspicious activity...")
         
-        # In a real implementation, this would listen to Azure Service Bus
-        # For now, we'll just show that the service is ready
-        while self.running:
-            await asyncio.sleep(5)
-            # This is where we'd receive and process actual Service Bus messages
+        # In a real implementation, this would be
+        # `async for msg in receiver: await process_audit_event(...)`.
+        # The mock has nothing to receive, so park until asked to stop.
+        await self._stop_event.wait()
+        self._stop_event.clear()  # re-arm so the receiver can be started again
+        self.running = False
     
     def stop_listening(self):
         """Stop listening for audit events"""
         self.running = False
+        self._stop_event.set()
 
 # Global receiver instance
 _event_receiver = MockAuditEventReceiver()
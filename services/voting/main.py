@@ -1,25 +1,49 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
-import sys
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Dict, Set, Tuple, Any
 import os
-import requests
-
-# Add parent directory to path for shared imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-services_dir = os.path.dirname(current_dir)
-root_dir = os.path.dirname(services_dir)
-sys.path.insert(0, root_dir)
+import asyncio
+import httpx
+from collections import defaultdict
+from datetime import datetime, timezone
 
 from shared.models import Vote, Nomination
-from shared.utils import generate_id, get_current_timestamp, SAMPLE_EMPLOYEES
-from shared.audit_utils import audit_vote_cast
+from shared.utils import generate_id, get_current_timestamp, ResponseCache, EMPLOYEES_BY_ID
+from shared.audit_utils import audit_vote_cast, init_audit_publisher, close_audit_publisher
 
-app = FastAPI(title="Voting Service", version="1.0.0")
+app = FastAPI(title="Voting Service", version="1.0.0", default_response_class=ORJSONResponse)
 
 # In-memory storage
 votes_db: Dict[str, Vote] = {}
 
+# Secondary indexes over votes_db
+votes_by_nomination: Dict[str, List[Vote]] = defaultdict(list)
+voted_pairs: Set[Tuple[str, str]] = set()  # (nomination_id, voter_id)
+
+# Snapshot of each voted-for nomination, as returned when the vote was verified.
+# Nominations are immutable, so this never goes stale.
+nominations_by_id: Dict[str, Dict[str, Any]] = {}
+nomination_created_at: Dict[str, datetime] = {}  # parsed once, for tie-breaks
+
+def _parse_created_at(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp, treating naive values as UTC"""
+    created_at = datetime.fromisoformat(value)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at
+
+# Locks guarding the duplicate-vote check and insert, sharded by nomination
+_VOTE_LOCK_SHARDS = 16
+_vote_locks = [asyncio.Lock() for _ in range(_VOTE_LOCK_SHARDS)]
+
+def _vote_lock(nomination_id: str) -> asyncio.Lock:
+    return _vote_locks[hash(nomination_id) % _VOTE_LOCK_SHARDS]
+
+# Serialized /votes responses, invalidated on every write
+_votes_cache = ResponseCache()
+_votes_json = TypeAdapter(List[Vote]).dump_json
+
 # Service configuration
 NOMINATIONS_SERVICE_URL = os.getenv("NOMINATIONS_SERVICE_URL", "http://localhost:8001")
 
@@ -36,34 +60,39 @@ async def create_vote(request: CreateVoteRequest):
     """Cast a vote for a nomination"""
     # Verify nomination exists
     try:
-        response = requests.get(f"{NOMINATIONS_SERVICE_URL}/nominations/{request.nomination_id}")
+        response = await app.state.http.get(f"{NOMINATIONS_SERVICE_URL}/nominations/{request.nomination_id}")
         if response.status_code != 200:
             raise HTTPException(status_code=404, detail="Nomination not found")
         nomination_data = response.json()
-    except requests.RequestException:
+    except httpx.RequestError:
         raise HTTPException(status_code=503, detail="Unable to verify nomination")
     
     # Find voter
-    voter = next((emp for emp in SAMPLE_EMPLOYEES if emp["id"] == request.voter_id), None)
+    voter = EMPLOYEES_BY_ID.get(request.voter_id)
     if not voter:
         raise HTTPException(status_code=404, detail="Voter not found")
     
-    # Check if voter has already voted for this nomination
-    existing_vote = next((v for v in votes_db.values() 
-                         if v.nomination_id == request.nomination_id and v.voter_id == request.voter_id), None)
-    if existing_vote:
-        raise HTTPException(status_code=400, detail="Voter has already voted for this nomination")
-    
-    # Create vote
-    vote = Vote(
-        id=generate_id(),
-        nomination_id=request.nomination_id,
-        voter_id=request.voter_id,
-        voter_name=voter["name"],
-        created_at=get_current_timestamp()
-    )
-    
-    votes_db[vote.id] = vote
+    async with _vote_lock(request.nomination_id):
+        # Check if voter has already voted for this nomination
+        if (request.nomination_id, request.voter_id) in voted_pairs:
+            raise HTTPException(status_code=400, detail="Voter has already voted for this nomination")
+        
+        # Create vote
+        vote = Vote(
+            id=generate_id(),
+            nomination_id=request.nomination_id,
+            voter_id=request.voter_id,
+            voter_name=voter["name"],
+            created_at=get_current_timestamp()
+        )
+        
+        votes_db[vote.id] = vote
+        votes_by_nomination[vote.nomination_id].append(vote)
+        if vote.nomination_id not in nominations_by_id:
+            nominations_by_id[vote.nomination_id] = nomination_data
+            nomination_created_at[vote.nomination_id] = _parse_created_at(nomination_data["created_at"])
+        voted_pairs.add((vote.nomination_id, vote.voter_id))
+        _votes_cache.invalidate()
     
     # Emit audit event
     try:
@@ -82,32 +111,75 @@ async def create_vote(request: CreateVoteRequest):
 @app.get("/votes", response_model=List[Vote])
 async def get_votes(nomination_id: str = None):
     """Get all votes, optionally filtered by nomination"""
-    votes = list(votes_db.values())
-    if nomination_id:
-        votes = [v for v in votes if v.nomination_id == nomination_id]
-    return votes
+    body = _votes_cache.get(nomination_id)
+    if body is None:
+        if nomination_id:
+            votes = votes_by_nomination.get(nomination_id, [])
+        else:
+            votes = list(votes_db.values())
+        body = _votes_cache.set(nomination_id, _votes_json(votes))
+    return Response(content=body, media_type="application/json")
 
 @app.get("/votes/count/{nomination_id}")
 async def get_vote_count(nomination_id: str):
     """Get vote count for a specific nomination"""
-    count = len([v for v in votes_db.values() if v.nomination_id == nomination_id])
+    count = len(votes_by_nomination.get(nomination_id, ()))
     return {"nomination_id": nomination_id, "vote_count": count}
 
 @app.get("/votes/results")
 async def get_voting_results():
     """Get voting results grouped by nomination"""
-    results = {}
-    for vote in votes_db.values():
-        if vote.nomination_id not in results:
-            results[vote.nomination_id] = {
-                "nomination_id": vote.nomination_id,
-                "vote_count": 0,
-                "voters": []
-            }
-        results[vote.nomination_id]["vote_count"] += 1
-        results[vote.nomination_id]["voters"].append(vote.voter_name)
+    return [
+        {
+            "nomination_id": nomination_id,
+            "vote_count": len(votes),
+            "voters": [vote.voter_name for vote in votes]
+        }
+        for nomination_id, votes in votes_by_nomination.items()
+    ]
+
+@app.get("/scoreboard")
+async def get_scoreboard():
+    """Get the leading nomination and its vote count for each category
     
-    return list(results.values())
+    Ties go to the earliest nomination, matching the order the nominations
+    service lists them in.
+    """
+    leaders: Dict[str, Tuple[Dict[str, Any], int]] = {}
+    for nomination_id, votes in votes_by_nomination.items():
+        nomination = nominations_by_id[nomination_id]
+        vote_count = len(votes)
+        leader = leaders.get(nomination["category"])
+        # Compare parsed timestamps: serialized ones drop a zero microsecond
+        # field, so their strings don't sort chronologically
+        if (leader is None or vote_count > leader[1]
+                or (vote_count == leader[1]
+                    and nomination_created_at[nomination_id] < nomination_created_at[leader[0]["id"]])):
+            leaders[nomination["category"]] = (nomination, vote_count)
+    
+    return [
+        {
+            "category": category,
+            "nomination_id": nomination["id"],
+            "employee_id": nomination["employee_id"],
+            "employee_name": nomination["employee_name"],
+            "reason": nomination["reason"],
+            "vote_count": vote_count
+        }
+        for category, (nomination, vote_count) in leaders.items()
+    ]
+
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared HTTP client and start the audit event publisher"""
+    app.state.http = httpx.AsyncClient(timeout=5.0)
+    await init_audit_publisher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP client and flush queued audit events"""
+    await app.state.http.aclose()
+    await close_audit_publisher()
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,130 +1,169 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
-import sys
+from fastapi import FastAPI, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Dict, Set
 import os
-import requests
-from collections import defaultdict
-
-# Add parent directory to path for shared imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-services_dir = os.path.dirname(current_dir)
-root_dir = os.path.dirname(services_dir)
-sys.path.insert(0, root_dir)
+import asyncio
+import httpx
 
 from shared.models import Winner, AwardCategory
 from shared.utils import generate_id, get_current_timestamp
-from shared.audit_utils import audit_winner_calculated
+from shared.audit_utils import audit_winner_calculated, init_audit_publisher, close_audit_publisher
+
+app = FastAPI(title="Winners Service", version="1.0.0", default_response_class=ORJSONResponse)
 
-app = FastAPI(title="Winners Service", version="1.0.0")
+class WinnersStore:
+    """In-memory winners, indexed by ID and by category"""
+    
+    def __init__(self):
+        self.winners: Dict[str, Winner] = {}
+        self.by_category: Dict[AwardCategory, str] = {}  # current winner ID per category
+    
+    def put(self, winner: Winner):
+        """Store a winner, replacing any existing winner for its category"""
+        old_id = self.by_category.get(winner.category)
+        if old_id:
+            del self.winners[old_id]
+        self.winners[winner.id] = winner
+        self.by_category[winner.category] = winner.id
+    
+    def clear(self):
+        """Remove every winner"""
+        self.winners.clear()
+        self.by_category.clear()
 
 # In-memory storage
-winners_db: Dict[str, Winner] = {}
+winners_store = WinnersStore()
+
+# Enum member lookup by value, skipping the EnumMeta.__call__ path
+_category_for = AwardCategory._value2member_map_.__getitem__
+
+# Serializes a calculation's winners in one pass
+_winners_adapter = TypeAdapter(List[Winner])
 
 # Service configuration
-NOMINATIONS_SERVICE_URL = os.getenv("NOMINATIONS_SERVICE_URL", "http://localhost:8001")
 VOTING_SERVICE_URL = os.getenv("VOTING_SERVICE_URL", "http://localhost:8002")
 
+# Background audit tasks, referenced until done so they aren't garbage collected
+_pending_audits: Set[asyncio.Task] = set()
+
+def _log_if_failed(task: asyncio.Task):
+    """Drop a finished audit task and report its failure, if any"""
+    _pending_audits.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # Don't let audit failures break the winner calculation
+        print(f"Failed to emit audit event: {task.exception()}")
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "winners"}
 
+# Shared resources, injected through async dependencies so FastAPI awaits
+# them directly rather than running them on its threadpool
+async def get_http_client() -> httpx.AsyncClient:
+    """Get the shared inter-service HTTP client"""
+    return app.state.http
+
+async def get_winners_store() -> WinnersStore:
+    """Get the winners store"""
+    return winners_store
+
 @app.post("/winners/calculate")
-async def calculate_winners():
+async def calculate_winners(
+    http: httpx.AsyncClient = Depends(get_http_client),
+    store: WinnersStore = Depends(get_winners_store)
+):
     """Calculate winners based on current votes"""
     try:
-        # Get all nominations
-        nominations_response = requests.get(f"{NOMINATIONS_SERVICE_URL}/nominations")
-        if nominations_response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Unable to fetch nominations")
-        nominations = nominations_response.json()
-        
-        # Get voting results
-        votes_response = requests.get(f"{VOTING_SERVICE_URL}/votes/results")
-        if votes_response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Unable to fetch voting results")
-        vote_results = votes_response.json()
-        
-        # Create a mapping of nomination_id to vote count
-        vote_counts = {result["nomination_id"]: result["vote_count"] for result in vote_results}
-        
-        # Group nominations by category and find winner for each
-        category_nominations = defaultdict(list)
-        for nomination in nominations:
-            category_nominations[nomination["category"]].append(nomination)
+        # One call to the voting service, which joins vote counts to
+        # nominations and picks each category's leader where the data lives
+        response = await http.get(f"{VOTING_SERVICE_URL}/scoreboard")
+        if response.status_code != 200:
+            raise HTTPException(status_code=503, detail="Unable to fetch scoreboard")
+        scoreboard = response.json()
+        if not scoreboard:
+            # No votes cast yet, so nothing to award
+            return ORJSONResponse({"message": "Calculated 0 winners", "winners": []})
         
         new_winners = []
         
-        for category, category_noms in category_nominations.items():
-            # Find nomination with highest votes in this category
-            best_nomination = None
-            highest_votes = -1
-            
-            for nomination in category_noms:
-                vote_count = vote_counts.get(nomination["id"], 0)
-                if vote_count > highest_votes:
-                    highest_votes = vote_count
-                    best_nomination = nomination
-            
-            if best_nomination and highest_votes > 0:
+        for leader in scoreboard:
+            if leader["vote_count"] > 0:
                 # Create winner entry
                 winner = Winner(
                     id=generate_id(),
-                    nomination_id=best_nomination["id"],
-                    employee_id=best_nomination["employee_id"],
-                    employee_name=best_nomination["employee_name"],
-                    category=AwardCategory(best_nomination["category"]),
-                    total_votes=highest_votes,
-                    reason=best_nomination["reason"],
+                    nomination_id=leader["nomination_id"],
+                    employee_id=leader["employee_id"],
+                    employee_name=leader["employee_name"],
+                    category=_category_for(leader["category"]),
+                    total_votes=leader["vote_count"],
+                    reason=leader["reason"],
                     created_at=get_current_timestamp()
                 )
                 
                 # Store winner (replace if already exists for this category)
-                existing_winner = next((w for w in winners_db.values() 
-                                      if w.category == winner.category), None)
-                if existing_winner:
-                    del winners_db[existing_winner.id]
-                
-                winners_db[winner.id] = winner
+                store.put(winner)
                 new_winners.append(winner)
                 
-                # Emit audit event
-                try:
-                    await audit_winner_calculated(
-                        category=winner.category.value,
-                        winner_id=winner.id,
-                        total_votes=winner.total_votes
-                    )
-                except Exception as e:
-                    # Don't let audit failures break the winner calculation
-                    print(f"Failed to emit audit event: {e}")
+                # Emit audit event in the background so the response isn't held up
+                task = asyncio.create_task(audit_winner_calculated(
+                    category=winner.category.value,
+                    winner_id=winner.id,
+                    total_votes=winner.total_votes
+                ))
+                _pending_audits.add(task)
+                task.add_done_callback(_log_if_failed)
         
-        return {"message": f"Calculated {len(new_winners)} winners", "winners": new_winners}
+        return ORJSONResponse({
+            "message": f"Calculated {len(new_winners)} winners",
+            "winners": _winners_adapter.dump_python(new_winners, mode="json")
+        })
         
-    except requests.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(status_code=503, detail=f"Service communication error: {str(e)}")
 
 @app.get("/winners", response_model=List[Winner])
-async def get_winners(category: AwardCategory = None):
+async def get_winners(category: AwardCategory = None, store: WinnersStore = Depends(get_winners_store)):
     """Get all winners, optionally filtered by category"""
-    winners = list(winners_db.values())
     if category:
-        winners = [w for w in winners if w.category == category]
-    return winners
+        winner_id = store.by_category.get(category)
+        return [store.winners[winner_id]] if winner_id else []
+    return list(store.winners.values())
 
 @app.get("/winners/{winner_id}", response_model=Winner)
-async def get_winner(winner_id: str):
+async def get_winner(winner_id: str, store: WinnersStore = Depends(get_winners_store)):
     """Get a specific winner by ID"""
-    if winner_id not in winners_db:
+    if winner_id not in store.winners:
         raise HTTPException(status_code=404, detail="Winner not found")
-    return winners_db[winner_id]
+    return store.winners[winner_id]
 
 @app.delete("/winners")
-async def clear_winners():
+async def clear_winners(store: WinnersStore = Depends(get_winners_store)):
     """Clear all winners (for testing purposes)"""
-    winners_db.clear()
+    store.clear()
     return {"message": "All winners cleared"}
 
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared HTTP client and start the audit event publisher"""
+    # Keep-alive pool shared by every calculation; retries only cover failed connects
+    app.state.http = httpx.AsyncClient(
+        timeout=5.0,
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    )
+    await init_audit_publisher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP client and flush queued audit events"""
+    await app.state.http.aclose()
+    if _pending_audits:
+        await asyncio.gather(*_pending_audits, return_exceptions=True)
+    await close_audit_publisher()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
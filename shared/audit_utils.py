@@ -2,22 +2,33 @@ import os
 import json
 import asyncio
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from azure.servicebus.aio import ServiceBusClient
 from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import MessageSizeExceededError
 from .models import AuditEvent, AuditEventType
 from .utils import generate_id, get_current_timestamp
 
 class AuditEventPublisher:
-    """Azure Service Bus publisher for audit events"""
+    """Azure Service Bus publisher for audit events
     
-    def __init__(self, connection_string: str = None):
+    Events are queued and published in batches by a background task, so
+    callers never wait on Service Bus round-trips.
+    """
+    
+    def __init__(self, connection_string: str = None, batch_size: int = 100, flush_interval: float = 0.05):
         self.connection_string = connection_string or os.getenv(
             "AZURE_SERVICEBUS_CONNECTION_STRING", 
             "mock://localhost"  # Mock connection for development
         )
         self.topic_name = "audit-events"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval  # seconds to wait for a batch to fill
         self._client = None
+        self._sender = None
+        self._queue = None
+        self._drain_task = None
+        self._loop = None
     
     async def get_client(self):
         """Get or create Service Bus client"""
@@ -27,8 +38,19 @@ class AuditEventPublisher:
                 self._client = MockServiceBusClient()
             else:
                 self._client = ServiceBusClient.from_connection_string(self.connection_string)
+                # One long-lived sender; opening a link per publish is expensive
+                self._sender = self._client.get_topic_sender(topic_name=self.topic_name)
         return self._client
     
+    def start(self):
+        """Start the background task that publishes queued events"""
+        loop = asyncio.get_running_loop()
+        # Restart if the task died or we're now running on a different event loop
+        if self._drain_task is None or self._drain_task.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._drain_task = loop.create_task(self._drain())
+    
     async def publish_event(
         self,
         event_type: AuditEventType,
@@ -41,7 +63,7 @@ class AuditEventPublisher:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
     ):
-        """Publish an audit event to Service Bus"""
+        """Queue an audit event for publishing to Service Bus"""
         try:
             event = AuditEvent(
                 id=generate_id(),
@@ -57,25 +79,91 @@ class AuditEventPublisher:
                 created_at=get_current_timestamp()
             )
             
-            client = await self.get_client()
-            if hasattr(client, 'get_topic_sender'):
-                # Real Azure Service Bus
-                sender = client.get_topic_sender(topic_name=self.topic_name)
-                message = ServiceBusMessage(event.model_dump_json())
-                await sender.send_messages(message)
-                await sender.close()
-            else:
-                # Mock client - just log the event
-                print(f"[AUDIT] {event.event_type}: {event.model_dump_json()}")
+            self.start()
+            self._queue.put_nowait(event)
             
         except Exception as e:
             # Don't let audit failures break the main service
             print(f"Failed to publish audit event: {e}")
     
+    async def _drain(self):
+        """Publish queued events in batches of up to batch_size"""
+        loop = asyncio.get_running_loop()
+        while True:
+            events = [await self._queue.get()]
+            
+            # Give a burst of events a short window to join this batch
+            deadline = loop.time() + self.flush_interval
+            while len(events) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    events.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._send_batch(events)
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+    
+    async def _send_batch(self, events: List[AuditEvent]):
+        """Send a batch of audit events to Service Bus"""
+        try:
+            await self.get_client()
+            if not isinstance(self._client, MockServiceBusClient):
+                # Real Azure Service Bus - pack events into as few size-limited batches as possible
+                sender = self._sender
+                batch = await sender.create_message_batch()
+                for event in events:
+                    # model_dump_json already runs in pydantic-core; orjson over model_dump()
+                    # or a TypeAdapter measured slower, and message construction dominates anyway.
+                    # Not memoized: every event gets a fresh id and is serialized exactly once.
+                    message = ServiceBusMessage(event.model_dump_json())
+                    try:
+                        batch.add_message(message)
+                    except MessageSizeExceededError:
+                        try:
+                            if not len(batch):
+                                raise
+                            # Batch is full - send it and retry in a fresh one
+                            await sender.send_messages(batch)
+                            batch = await sender.create_message_batch()
+                            batch.add_message(message)
+                        except MessageSizeExceededError:
+                            # Too large even for an empty batch; skip it and keep packing the rest
+                            print(f"Dropping audit event {event.id}: too large for a Service Bus batch")
+                if len(batch):
+                    await sender.send_messages(batch)
+            else:
+                # Mock client - just log the events
+                for event in events:
+                    print(f"[AUDIT] {event.event_type}: {event.model_dump_json()}")
+            
+        except Exception as e:
+            # Don't let audit failures break the main service
+            print(f"Failed to publish {len(events)} audit events: {e}")
+    
+    async def flush(self):
+        """Wait until every queued event has been published"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+    
     async def close(self):
-        """Close the Service Bus client"""
+        """Publish any queued events, then close the Service Bus client"""
+        await self.flush()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        if self._sender is not None:
+            await self._sender.close()
+            self._sender = None
         if self._client and hasattr(self._client, 'close'):
             await self._client.close()
+        # Forget the closed client so a restarted publisher opens a fresh one
+        self._client = None
 
 class MockServiceBusClient:
     """Mock Service Bus client for development/testing"""
@@ -87,19 +175,19 @@ class MockServiceBusClient:
         pass
 
 # Global publisher instance
-_audit_publisher = None
+audit_publisher = AuditEventPublisher()
+
+async def init_audit_publisher():
+    """Start the global audit publisher (call from service startup)"""
+    audit_publisher.start()
 
-async def get_audit_publisher() -> AuditEventPublisher:
-    """Get the global audit publisher instance"""
-    global _audit_publisher
-    if _audit_publisher is None:
-        _audit_publisher = AuditEventPublisher()
-    return _audit_publisher
+async def close_audit_publisher():
+    """Flush and close the global audit publisher (call from service shutdown)"""
+    await audit_publisher.close()
 
 async def audit_nomination_submitted(nominator_id: str, nominator_name: str, employee_id: str, category: str, nomination_id: str):
     """Audit event for nomination submission"""
-    publisher = await get_audit_publisher()
-    await publisher.publish_event(
+    await audit_publisher.publish_event(
         event_type=AuditEventType.NOMINATION_SUBMITTED,
         service_name="nominations",
         user_id=nominator_id,
@@ -115,8 +203,7 @@ async def audit_nomination_submitted(nominator_id: str, nominator_name: str, emp
 
 async def audit_vote_cast(voter_id: str, voter_name: str, nomination_id: str, vote_id: str):
     """Audit event for vote casting"""
-    publisher = await get_audit_publisher()
-    await publisher.publish_event(
+    await audit_publisher.publish_event(
         event_type=AuditEventType.VOTE_CAST,
         service_name="voting",
         user_id=voter_id,
@@ -131,8 +218,7 @@ async def audit_vote_cast(voter_id: str, voter_name: str, nomination_id: str, vo
 
 async def audit_winner_calculated(category: str, winner_id: str, total_votes: int):
     """Audit event for winner calculation"""
-    publisher = await get_audit_publisher()
-    await publisher.publish_event(
+    await audit_publisher.publish_event(
         event_type=AuditEventType.WINNER_CALCULATED,
         service_name="winners",
         resource_id=winner_id,
@@ -146,8 +232,7 @@ async def audit_winner_calculated(category: str, winner_id: str, total_votes: in
 
 async def audit_notification_sent(winner_id: str, employee_id: str, employee_name: str, notification_id: str):
     """Audit event for notification sending"""
-    publisher = await get_audit_publisher()
-    await publisher.publish_event(
+    await audit_publisher.publish_event(
         event_type=AuditEventType.NOTIFICATION_SENT,
         service_name="notifications",
         user_id=employee_id,
@@ -160,30 +245,42 @@ async def audit_notification_sent(winner_id: str, employee_id: str, employee_nam
         }
     )
 
+# Base risk scores by event type
+_RISK_BY_TYPE = {
+    AuditEventType.NOMINATION_SUBMITTED: 10,
+    AuditEventType.VOTE_CAST: 15,
+    AuditEventType.WINNER_CALCULATED: 20,
+    AuditEventType.NOTIFICATION_SENT: 5,
+    AuditEventType.SUSPICIOUS_ACTIVITY: 80
+}
+
+# Patterns in event details that raise the risk score, and by how much
+_RISK_TOKENS = {"multiple": 15, "rapid": 25}
+
 def calculate_risk_score(event: AuditEvent) -> int:
     """Calculate risk score for an audit event (0-100)"""
-    score = 0
-    
-    # Base risk scores by event type
-    risk_scores = {
-        AuditEventType.NOMINATION_SUBMITTED: 10,
-        AuditEventType.VOTE_CAST: 15,
-        AuditEventType.WINNER_CALCULATED: 20,
-        AuditEventType.NOTIFICATION_SENT: 5,
-        AuditEventType.SUSPICIOUS_ACTIVITY: 80
-    }
-    
-    score += risk_scores.get(event.event_type, 0)
+    # Base risk score by event type
+    score = _RISK_BY_TYPE.get(event.event_type, 0)
     
     # Increase risk for missing user information
     if not event.user_id:
         score += 20
     
-    # Increase risk for certain patterns in details
+    # Increase risk for certain patterns in details (each pattern counts once)
     if event.details:
-        if "multiple" in str(event.details).lower():
-            score += 15
-        if "rapid" in str(event.details).lower():
-            score += 25
+        matched = set()
+        # Walk nested dicts and lists too; only strings can hold a pattern
+        pending = [event.details]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, str):
+                text = item.lower()
+                matched.update(token for token in _RISK_TOKENS if token in text)
+            elif isinstance(item, dict):
+                pending.extend(item.keys())
+                pending.extend(item.values())
+            elif isinstance(item, (list, tuple, set)):
+                pending.extend(item)
+        score += sum(_RISK_TOKENS[token] for token in matched)
     
     return min(score, 100)
\ No newline at end of file
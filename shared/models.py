@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from enum import Enum
@@ -37,6 +37,8 @@ class Vote(BaseModel):
     created_at: datetime
 
 class Winner(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     nomination_id: str
     employee_id: str
@@ -64,6 +66,8 @@ class AuditEventType(str, Enum):
     SUSPICIOUS_ACTIVITY = "suspicious_activity"
 
 class AuditEvent(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     event_type: AuditEventType
     service_name: str
@@ -77,6 +81,7 @@ class AuditEvent(BaseModel):
     created_at: datetime
 
 class AuditLog(BaseModel):
+    # Left mutable: investigations update the stored log in place
     id: str
     event_id: str
     event_type: AuditEventType
@@ -1,13 +1,47 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Dict, Hashable, Optional, Tuple
 import uuid
 
+_UTC = timezone.utc
+
 def generate_id() -> str:
-    """Generate a unique ID"""
-    return str(uuid.uuid4())
+    """Generate a unique ID (32 hex characters)"""
+    return uuid.uuid4().hex
 
 def get_current_timestamp() -> datetime:
-    """Get current timestamp"""
-    return datetime.utcnow()
+    """Get current timestamp (timezone-aware UTC)"""
+    return datetime.now(_UTC)
+
+class ResponseCache:
+    """Serialized response bodies cached against a store version
+    
+    Call invalidate() whenever the backing store changes; entries cached
+    under an older version simply miss and are overwritten on next use.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        self.version = 0
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[int, bytes]] = {}
+    
+    def invalidate(self):
+        """Mark every cached body as stale"""
+        self.version += 1
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get the cached body for key if it is still current"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == self.version:
+            return entry[1]
+        return None
+    
+    def set(self, key: Hashable, body: bytes) -> bytes:
+        """Cache body for key under the current version"""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            # Evict the oldest entry
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (self.version, body)
+        return body
 
 # Sample employees data for demonstration
 SAMPLE_EMPLOYEES = [
@@ -19,4 +53,7 @@ SAMPLE_EMPLOYEES = [
     {"id": "emp_006", "name": "Kevin Malone", "department": "Accounting", "email": "kevin@dundermifflin.com"},
     {"id": "emp_007", "name": "Angela Martin", "department": "Accounting", "email": "angela@dundermifflin.com"},
     {"id": "emp_008", "name": "Oscar Martinez", "department": "Accounting", "email": "oscar@dundermifflin.com"},
-]
\ No newline at end of file
+]
+
+# Employees indexed by ID for constant-time lookups
+EMPLOYEES_BY_ID = {emp["id"]: emp for emp in SAMPLE_EMPLOYEES}
\ No newline at end of file
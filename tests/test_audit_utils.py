@@ -0,0 +1,180 @@
+import sys
+import os
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from azure.servicebus.exceptions import MessageSizeExceededError
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.audit_utils import AuditEventPublisher, calculate_risk_score
+from shared.models import AuditEvent, AuditEventType
+
+OVERSIZED = "oversized-event"
+
+class RecordingBatch:
+    """Message batch stand-in holding at most max_messages messages
+    
+    Messages mentioning OVERSIZED never fit, mimicking a single event larger
+    than the maximum batch size.
+    """
+    
+    def __init__(self, max_messages):
+        self.max_messages = max_messages
+        self.messages = []
+    
+    def add_message(self, message):
+        if len(self.messages) >= self.max_messages or OVERSIZED in str(message):
+            raise MessageSizeExceededError(message="Batch is full")
+        self.messages.append(message)
+    
+    def __len__(self):
+        return len(self.messages)
+
+class RecordingSender:
+    """Topic sender stand-in that records the messages in each sent batch"""
+    
+    def __init__(self, batches, max_messages):
+        self.batches = batches
+        self.max_messages = max_messages
+    
+    async def create_message_batch(self):
+        return RecordingBatch(self.max_messages)
+    
+    async def send_messages(self, batch):
+        self.batches.append(batch.messages)
+    
+    async def close(self):
+        pass
+
+class RecordingServiceBusClient:
+    """Service Bus client stand-in that hands out recording senders"""
+    
+    def __init__(self, max_messages=1000):
+        self.batches = []
+        self.max_messages = max_messages
+    
+    def get_topic_sender(self, topic_name):
+        return RecordingSender(self.batches, self.max_messages)
+    
+    async def close(self):
+        pass
+
+def make_publisher(client=None, **kwargs):
+    publisher = AuditEventPublisher(connection_string="mock://localhost", **kwargs)
+    publisher._client = client or RecordingServiceBusClient()
+    publisher._sender = publisher._client.get_topic_sender(topic_name=publisher.topic_name)
+    return publisher
+
+def test_publish_events_are_batched():
+    """Test that a burst of events is sent as a single batch"""
+    async def run():
+        publisher = make_publisher()
+        for i in range(3):
+            await publisher.publish_event(
+                event_type=AuditEventType.VOTE_CAST,
+                service_name="voting",
+                user_id=f"emp_00{i}"
+            )
+        client = publisher._client
+        await publisher.close()
+        return client.batches
+    
+    batches = asyncio.run(run())
+    assert len(batches) == 1
+    assert len(batches[0]) == 3
+
+def test_batches_respect_batch_size():
+    """Test that batches never exceed the configured batch size"""
+    async def run():
+        publisher = make_publisher(batch_size=2)
+        for _ in range(5):
+            await publisher.publish_event(event_type=AuditEventType.NOMINATION_SUBMITTED, service_name="nominations")
+        client = publisher._client
+        await publisher.close()
+        return client.batches
+    
+    batches = asyncio.run(run())
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+def test_full_message_batch_is_split():
+    """Test events overflowing a Service Bus batch go out in another batch"""
+    async def run():
+        publisher = make_publisher(client=RecordingServiceBusClient(max_messages=3))
+        for _ in range(4):
+            await publisher.publish_event(event_type=AuditEventType.VOTE_CAST, service_name="voting")
+        client = publisher._client
+        await publisher.close()
+        return client.batches
+    
+    batches = asyncio.run(run())
+    assert [len(batch) for batch in batches] == [3, 1]
+
+def test_oversized_event_is_skipped_without_dropping_the_rest():
+    """Test an event too large for any batch is skipped and later events still go out"""
+    async def run():
+        publisher = make_publisher(client=RecordingServiceBusClient(max_messages=2))
+        for user_id in [OVERSIZED, "emp_001", "emp_002", OVERSIZED, "emp_003"]:
+            await publisher.publish_event(event_type=AuditEventType.VOTE_CAST, service_name="voting", user_id=user_id)
+        client = publisher._client
+        await publisher.close()
+        return client.batches
+    
+    batches = asyncio.run(run())
+    sent = [[json.loads(str(message))["user_id"] for message in batch] for batch in batches]
+    assert sent == [["emp_001", "emp_002"], ["emp_003"]]
+
+def test_publisher_reopens_client_after_close(monkeypatch):
+    """Test a closed publisher sends through a fresh client when reused"""
+    clients = []
+    
+    class FakeServiceBusClient:
+        @staticmethod
+        def from_connection_string(connection_string):
+            clients.append(RecordingServiceBusClient())
+            return clients[-1]
+    
+    monkeypatch.setattr("shared.audit_utils.ServiceBusClient", FakeServiceBusClient)
+    publisher = AuditEventPublisher(connection_string="Endpoint=sb://example/")
+    
+    async def publish_and_close():
+        await publisher.publish_event(event_type=AuditEventType.VOTE_CAST, service_name="voting")
+        await publisher.close()
+    
+    # Each run is a new event loop, like a service restarting the singleton
+    asyncio.run(publish_and_close())
+    asyncio.run(publish_and_close())
+    assert [len(client.batches) for client in clients] == [1, 1]
+
+def make_event(**kwargs):
+    return AuditEvent(id="risk-event", service_name="voting", created_at=datetime.utcnow(), **kwargs)
+
+def test_risk_score_base_and_missing_user():
+    """Test base risk by event type plus the missing-user penalty"""
+    assert calculate_risk_score(make_event(event_type=AuditEventType.VOTE_CAST, user_id="emp_001")) == 15
+    assert calculate_risk_score(make_event(event_type=AuditEventType.VOTE_CAST)) == 35
+
+def test_risk_score_detail_patterns():
+    """Test suspicious detail patterns raise the score once each"""
+    event = make_event(
+        event_type=AuditEventType.VOTE_CAST,
+        user_id="emp_003",
+        details={"note": "Multiple RAPID votes", "again": "multiple", "count": 7}
+    )
+    assert calculate_risk_score(event) == 15 + 15 + 25
+
+def test_risk_score_nested_detail_patterns():
+    """Test patterns inside nested detail values still count, once each"""
+    base = make_event(event_type=AuditEventType.VOTE_CAST, user_id="emp_003")
+    flagged = base.model_copy(update={"details": {"flags": ["rapid"]}})
+    assert calculate_risk_score(flagged) == 15 + 25
+    
+    nested = base.model_copy(update={"details": {"meta": {"pattern": "multiple rapid", "history": [("Rapid",)]}}})
+    assert calculate_risk_score(nested) == 15 + 15 + 25
+
+def test_risk_score_capped_at_100():
+    """Test the risk score never exceeds 100"""
+    event = make_event(event_type=AuditEventType.SUSPICIOUS_ACTIVITY, details={"alert": "rapid"})
+    assert calculate_risk_score(event) == 100
@@ -56,4 +56,16 @@ def test_create_nomination_invalid_employee():
     
     response = client.post("/nominations", json=nomination_data)
     assert response.status_code == 404
-    assert "Employee not found" in response.json()["detail"]
\ No newline at end of file
+    assert "Employee not found" in response.json()["detail"]
+
+def test_create_nomination_invalid_nominator():
+    nomination_data = {
+        "employee_id": "emp_001",
+        "category": "Fine Work",
+        "nominator_id": "invalid_id",
+        "reason": "Test reason"
+    }
+    
+    response = client.post("/nominations", json=nomination_data)
+    assert response.status_code == 404
+    assert "Nominator not found" in response.json()["detail"]
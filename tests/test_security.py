@@ -1,13 +1,14 @@
 import sys
 import os
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.security.main import app
+from services.security.main import app, MockAuditEventReceiver
 from shared.models import AuditEvent, AuditEventType
 
 client = TestClient(app)
@@ -180,4 +181,155 @@ def test_audit_log_filters():
     assert response.status_code == 200
     logs = response.json()
     assert len(logs) == 1
-    assert logs[0]["event_type"] == "vote_cast"
\ No newline at end of file
+    assert logs[0]["event_type"] == "vote_cast"
+
+def test_audit_logs_newest_first_with_limit():
+    """Test audit logs are returned newest first and honour the limit"""
+    client.delete("/audit/logs")
+    
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for i, minutes in enumerate([5, 1, 9, 3]):
+        client.post("/audit/test-event", json={
+            "id": f"order-event-{i}",
+            "event_type": "vote_cast",
+            "service_name": "voting",
+            "user_id": "emp_001",
+            "created_at": (base + timedelta(minutes=minutes)).isoformat()
+        })
+    
+    response = client.get("/audit/logs?limit=3")
+    assert response.status_code == 200
+    assert [log["event_id"] for log in response.json()] == ["order-event-2", "order-event-0", "order-event-3"]
+
+def test_suspicious_activity_ordered_by_risk():
+    """Test suspicious activity is ordered riskiest first and skips investigated logs"""
+    client.delete("/audit/logs")
+    
+    events = [
+        {"id": "risk-event-1", "event_type": "vote_cast", "service_name": "voting",
+         "details": {"note": "rapid votes"}},  # 15 + 20 + 25 = 60
+        {"id": "risk-event-2", "event_type": "suspicious_activity", "service_name": "security",
+         "user_id": "emp_003"},  # 80
+        {"id": "risk-event-3", "event_type": "nomination_submitted", "service_name": "nominations",
+         "user_id": "emp_001"},  # 10
+    ]
+    for event in events:
+        client.post("/audit/test-event", json={**event, "created_at": datetime.utcnow().isoformat()})
+    
+    response = client.get("/audit/suspicious?min_risk_score=50")
+    assert [log["event_id"] for log in response.json()] == ["risk-event-2", "risk-event-1"]
+    
+    log_id = response.json()[0]["id"]
+    client.post(f"/audit/logs/{log_id}/investigate", json={"investigation_notes": "Bears. Beets. Battlestar Galactica."})
+    
+    response = client.get("/audit/suspicious?min_risk_score=50")
+    assert [log["event_id"] for log in response.json()] == ["risk-event-1"]
+
+def test_security_metrics_counts():
+    """Test metrics reflect ingested and investigated logs"""
+    client.delete("/audit/logs")
+    
+    events = [
+        {"id": "metric-event-1", "event_type": "suspicious_activity", "service_name": "security"},  # 100
+        {"id": "metric-event-2", "event_type": "vote_cast", "service_name": "voting",
+         "details": {"note": "rapid votes"}},  # 60
+        {"id": "metric-event-3", "event_type": "vote_cast", "service_name": "voting", "user_id": "emp_002"},  # 15
+        {"id": "metric-event-4", "event_type": "suspicious_activity", "service_name": "security",
+         "created_at": (datetime.utcnow() - timedelta(days=2)).isoformat()},  # 100, too old to be recent
+    ]
+    for event in events:
+        client.post("/audit/test-event", json={"created_at": datetime.utcnow().isoformat(), **event})
+    
+    metrics = client.get("/audit/metrics").json()
+    assert metrics["total_events"] == 4
+    assert metrics["high_risk_events"] == 2
+    assert metrics["pending_investigations"] == 3
+    assert metrics["investigated_events"] == 0
+    assert metrics["events_by_type"] == {"suspicious_activity": 2, "vote_cast": 2}
+    assert [log["event_id"] for log in metrics["recent_suspicious_activity"]] == ["metric-event-1", "metric-event-2"]
+    
+    log_id = metrics["recent_suspicious_activity"][0]["id"]
+    for _ in range(2):
+        client.post(f"/audit/logs/{log_id}/investigate", json={"investigation_notes": "Identity theft is not a joke."})
+    
+    metrics = client.get("/audit/metrics").json()
+    assert metrics["investigated_events"] == 1
+    assert metrics["pending_investigations"] == 2
+
+def test_suspicious_activity_below_index_threshold():
+    """Test suspicious activity queries below the indexed threshold still see low-risk logs"""
+    client.delete("/audit/logs")
+    
+    client.post("/audit/test-event", json={
+        "id": "low-risk-event",
+        "event_type": "nomination_submitted",
+        "service_name": "nominations",
+        "user_id": "emp_001",
+        "created_at": datetime.utcnow().isoformat()
+    })  # 10
+    
+    assert client.get("/audit/suspicious").json() == []
+    response = client.get("/audit/suspicious?min_risk_score=10")
+    assert [log["event_id"] for log in response.json()] == ["low-risk-event"]
+
+def test_duplicate_audit_event_ignored():
+    """Test the same audit event is only logged once"""
+    client.delete("/audit/logs")
+    
+    event_data = {
+        "id": "duplicate-event",
+        "event_type": "vote_cast",
+        "service_name": "voting",
+        "user_id": "emp_001",
+        "created_at": datetime.utcnow().isoformat()
+    }
+    client.post("/audit/test-event", json=event_data)
+    client.post("/audit/test-event", json=event_data)
+    
+    logs = client.get("/audit/logs").json()
+    assert len(logs) == 1
+
+def test_audit_logs_reflect_investigation():
+    """Test repeated log queries pick up investigations made in between"""
+    client.delete("/audit/logs")
+    
+    client.post("/audit/test-event", json={
+        "id": "cached-event",
+        "event_type": "vote_cast",
+        "service_name": "voting",
+        "user_id": "emp_001",
+        "created_at": datetime.utcnow().isoformat()
+    })
+    
+    logs = client.get("/audit/logs").json()
+    assert logs[0]["investigated"] == False
+    
+    client.post(f"/audit/logs/{logs[0]['id']}/investigate", json={"investigation_notes": "Checked."})
+    
+    logs = client.get("/audit/logs").json()
+    assert logs[0]["investigated"] == True
+
+def test_mock_receiver_stops_when_asked():
+    """Test the mock receiver parks until stop_listening is called"""
+    async def run():
+        receiver = MockAuditEventReceiver()
+        listener = asyncio.create_task(receiver.start_listening())
+        await asyncio.sleep(0)
+        assert receiver.running
+        
+        receiver.stop_listening()
+        await asyncio.wait_for(listener, timeout=1)
+        return receiver.running
+    
+    assert asyncio.run(run()) == False
+
+def test_mock_receiver_honours_stop_before_start():
+    """Test a stop requested before the listener runs is not lost"""
+    async def run():
+        receiver = MockAuditEventReceiver()
+        listener = asyncio.create_task(receiver.start_listening())
+        receiver.stop_listening()
+        await asyncio.wait_for(listener, timeout=1)
+        return receiver.running
+    
+    assert asyncio.run(run()) == False
@@ -0,0 +1,101 @@
+import sys
+import os
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.voting.main import app
+
+def make_nomination(nomination_id, employee_id, employee_name, category, created_at):
+    return {"id": nomination_id, "employee_id": employee_id, "employee_name": employee_name,
+            "category": category, "reason": f"{employee_name} deserves it", "created_at": created_at}
+
+KNOWN_NOMINATIONS = {
+    nomination["id"]: nomination
+    for nomination in [
+        make_nomination("nom_001", "emp_001", "Jim Halpert", "Hottest in the Office", "2024-01-01T12:00:00"),
+        make_nomination("nom_002", "emp_003", "Dwight Schrute", "Busiest Beaver", "2024-01-01T12:01:00"),
+        make_nomination("nom_010", "emp_006", "Kevin Malone", "Whitest Sneakers", "2024-01-01T12:02:00"),
+        make_nomination("nom_011", "emp_004", "Michael Scott", "Whitest Sneakers", "2024-01-01T12:03:00"),
+        # Same second; the older one serializes without a fraction and sorts later as a string
+        make_nomination("nom_020", "emp_005", "Angela Martin", "Best Dressed", "2024-01-01T12:04:00.123456Z"),
+        make_nomination("nom_021", "emp_007", "Oscar Martinez", "Best Dressed", "2024-01-01T12:04:00Z"),
+    ]
+}
+
+def mock_nominations_service(request: httpx.Request) -> httpx.Response:
+    """Stand-in for the nominations service's GET /nominations/{id}"""
+    nomination_id = request.url.path.rsplit("/", 1)[-1]
+    if nomination_id not in KNOWN_NOMINATIONS:
+        return httpx.Response(404, json={"detail": "Nomination not found"})
+    return httpx.Response(200, json=KNOWN_NOMINATIONS[nomination_id])
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        # Swap the startup client for a mock; shutdown closes whichever is installed
+        test_client.portal.call(app.state.http.aclose)
+        app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(mock_nominations_service))
+        yield test_client
+
+def test_health_check(client):
+    """Test voting service health endpoint"""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["service"] == "voting"
+
+def test_create_vote(client):
+    """Test casting a vote and reading it back by nomination"""
+    response = client.post("/votes", json={"nomination_id": "nom_001", "voter_id": "emp_003"})
+    assert response.status_code == 200
+    assert response.json()["voter_name"] == "Dwight Schrute"
+    
+    votes = client.get("/votes?nomination_id=nom_001").json()
+    assert "emp_003" in [v["voter_id"] for v in votes]
+
+def test_duplicate_vote_rejected(client):
+    """Test that a voter cannot vote twice for the same nomination"""
+    client.post("/votes", json={"nomination_id": "nom_002", "voter_id": "emp_004"})
+    
+    response = client.post("/votes", json={"nomination_id": "nom_002", "voter_id": "emp_004"})
+    assert response.status_code == 400
+    assert "already voted" in response.json()["detail"]
+
+def test_vote_unknown_nomination(client):
+    """Test voting for a nomination that does not exist"""
+    response = client.post("/votes", json={"nomination_id": "nom_999", "voter_id": "emp_001"})
+    assert response.status_code == 404
+
+def test_vote_count_and_results(client):
+    """Test vote counts and grouped results agree"""
+    client.post("/votes", json={"nomination_id": "nom_002", "voter_id": "emp_005"})
+    
+    count = client.get("/votes/count/nom_002").json()["vote_count"]
+    results = {r["nomination_id"]: r for r in client.get("/votes/results").json()}
+    assert results["nom_002"]["vote_count"] == count
+    assert "Stanley Hudson" in results["nom_002"]["voters"]
+
+def test_scoreboard_ties_go_to_earliest_nomination(client):
+    """Test the scoreboard leader per category, breaking ties by nomination age"""
+    client.post("/votes", json={"nomination_id": "nom_011", "voter_id": "emp_001"})
+    client.post("/votes", json={"nomination_id": "nom_010", "voter_id": "emp_002"})
+    
+    leaders = {entry["category"]: entry for entry in client.get("/scoreboard").json()}
+    assert leaders["Whitest Sneakers"]["nomination_id"] == "nom_010"
+    assert leaders["Whitest Sneakers"]["vote_count"] == 1
+    
+    client.post("/votes", json={"nomination_id": "nom_011", "voter_id": "emp_003"})
+    leaders = {entry["category"]: entry for entry in client.get("/scoreboard").json()}
+    assert leaders["Whitest Sneakers"]["employee_name"] == "Michael Scott"
+    assert leaders["Whitest Sneakers"]["vote_count"] == 2
+
+def test_scoreboard_tie_break_compares_timestamps_not_strings(client):
+    """Test a whole-second created_at still wins a tie against a later fractional one"""
+    client.post("/votes", json={"nomination_id": "nom_020", "voter_id": "emp_001"})
+    client.post("/votes", json={"nomination_id": "nom_021", "voter_id": "emp_002"})
+    
+    leaders = {entry["category"]: entry for entry in client.get("/scoreboard").json()}
+    assert leaders["Best Dressed"]["nomination_id"] == "nom_021"
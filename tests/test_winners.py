@@ -0,0 +1,112 @@
+import sys
+import os
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.winners.main import app, get_http_client, get_winners_store, WinnersStore
+
+SCOREBOARD = [
+    {"category": "Hottest in the Office", "nomination_id": "nom_002", "employee_id": "emp_003",
+     "employee_name": "Dwight Schrute", "reason": "Self-nominated", "vote_count": 3},
+    {"category": "Whitest Sneakers", "nomination_id": "nom_003", "employee_id": "emp_006",
+     "employee_name": "Kevin Malone", "reason": "Pristine New Balances", "vote_count": 1},
+]
+
+def mock_services(request: httpx.Request) -> httpx.Response:
+    """Stand-in for the voting service"""
+    if request.url.path == "/scoreboard":
+        return httpx.Response(200, json=SCOREBOARD)
+    return httpx.Response(404)
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        test_client.delete("/winners")
+        yield test_client
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def voting_service(client):
+    """Point the HTTP client dependency at a mock voting service (mock_services by default)"""
+    opened = []
+    
+    def use(handler):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        opened.append(http)
+        
+        async def get_mock_http_client():
+            return http
+        app.dependency_overrides[get_http_client] = get_mock_http_client
+    
+    use(mock_services)
+    yield use
+    for http in opened:
+        client.portal.call(http.aclose)
+
+def test_health_check(client):
+    """Test winners service health endpoint"""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["service"] == "winners"
+
+def test_calculate_winners(client, voting_service):
+    """Test one winner is picked per category with votes"""
+    response = client.post("/winners/calculate")
+    assert response.status_code == 200
+    
+    winners = {w["category"]: w for w in response.json()["winners"]}
+    assert set(winners) == {"Hottest in the Office", "Whitest Sneakers"}
+    assert winners["Hottest in the Office"]["employee_name"] == "Dwight Schrute"
+    assert winners["Hottest in the Office"]["total_votes"] == 3
+    assert winners["Whitest Sneakers"]["nomination_id"] == "nom_003"
+
+def test_recalculating_replaces_category_winner(client, voting_service):
+    """Test recalculation keeps a single winner per category"""
+    client.post("/winners/calculate")
+    client.post("/winners/calculate")
+    
+    winners = client.get("/winners").json()
+    assert len(winners) == 2
+    
+    response = client.get("/winners?category=Whitest Sneakers")
+    assert [w["employee_name"] for w in response.json()] == ["Kevin Malone"]
+
+def test_calculate_winners_service_unavailable(client, voting_service):
+    """Test upstream failures surface as 503"""
+    voting_service(lambda request: httpx.Response(500))
+    
+    response = client.post("/winners/calculate")
+    assert response.status_code == 503
+
+def test_calculate_winners_without_votes(client, voting_service):
+    """Test an empty scoreboard yields no winners"""
+    voting_service(lambda request: httpx.Response(200, json=[]))
+    
+    response = client.post("/winners/calculate")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Calculated 0 winners", "winners": []}
+    assert client.get("/winners").json() == []
+
+def test_routes_share_the_injected_store(client, voting_service):
+    """Test every winners route reads and writes the injected store"""
+    client.post("/winners/calculate")
+    
+    store = WinnersStore()
+    async def get_fresh_store():
+        return store
+    app.dependency_overrides[get_winners_store] = get_fresh_store
+    
+    response = client.post("/winners/calculate")
+    assert response.status_code == 200
+    assert len(store.winners) == 2
+    
+    winner_id = store.by_category["Whitest Sneakers"]
+    assert client.get(f"/winners/{winner_id}").json()["employee_name"] == "Kevin Malone"
+    assert len(client.get("/winners").json()) == 2
+    
+    client.delete("/winners")
+    assert store.winners == {} and store.by_category == {}